@@ -0,0 +1,24 @@
+"""
+Boot profiler
+
+Timestamps each boot phase (imports, constructors) so bundles can be compared.
+Import this first in code.py; the marks are printed to the serial console by report()
+as "bootprof,<phase>,<ms since boot>" lines that tools/boot_report.py reads.
+The "start" mark is taken on import, so its phase covers compiling code.py (or loading
+app.mpy). Soft reloads keep the clock running, press reset before capturing a boot.
+"""
+import time
+
+_marks = []
+
+
+def mark(phase):
+    _marks.append((phase, time.monotonic_ns()))
+
+
+mark("start")
+
+
+def report():
+    for phase, t in _marks:
+        print(f"bootprof,{phase},{t / 1000000:.1f}")
@@ -0,0 +1,95 @@
+"""
+Front button input router
+
+Drains every front button keypad queue as events arrive and turns them into
+short, long and repeat gestures for the current page, independent of the ui frame rate.
+"""
+import asyncio
+from adafruit_ticks import ticks_ms, ticks_add, ticks_diff
+
+SHORT = "short"
+LONG = "long"
+REPEAT = "repeat"
+
+
+class ButtonRouter(object):
+    def __init__(self, page, long_ms=600, repeat_ms=150, poll_s=0.005):
+        self.page = page
+        # set whenever the page (or its state) should be re-entered by the ui
+        self.dirty = True
+
+        self.long_ms = long_ms
+        self.repeat_ms = repeat_ms
+        self.poll_s = poll_s
+
+        self._sources = []
+        # button -> [tick the next long/repeat is due, long already fired]
+        self._down = {}
+
+    def add_source(self, keys, buttons):
+        """Route a keypad.Keys' key numbers onto front button numbers (0 -> D0, 1 -> D1, 2 -> D2)
+
+        keypad.Keys debounces (its interval), so events arrive here already clean.
+        """
+        self._sources.append((keys, tuple(buttons)))
+
+    def _holds(self, button):
+        return (self.page.callback(button, LONG) is not None
+                or self.page.callback(button, REPEAT) is not None)
+
+    def _dispatch(self, button, gesture):
+        """Go to a gesture's page, or run its callable (which may return a page to go to). -> True when the page changed"""
+        cb = self.page.callback(button, gesture)
+        if cb is None:
+            return False
+        # pages (anything that can be entered) are navigation targets, everything else is an action
+        target = cb if hasattr(cb, "into") else cb()
+        self.dirty = True
+        if target is None or target is self.page or not hasattr(target, "into"):
+            return False
+        self.page = target
+        # buttons still held belong to the old page, don't carry their gestures over
+        self._down.clear()
+        return True
+
+    def _on_press(self, button, now):
+        if self._holds(button):
+            # wait for the release (short) or the hold timeout (long)
+            self._down[button] = [ticks_add(now, self.long_ms), False]
+        else:
+            # nothing to disambiguate, fire straight away
+            self._dispatch(button, SHORT)
+
+    def _on_release(self, button, now):
+        state = self._down.pop(button, None)
+        if state is not None and not state[1]:
+            self._dispatch(button, SHORT)
+
+    def _poll_holds(self, now):
+        for button, state in list(self._down.items()):
+            if ticks_diff(now, state[0]) < 0:
+                continue
+            if state[1]:
+                state[0] = ticks_add(state[0], self.repeat_ms)
+                changed = self._dispatch(button, REPEAT)
+            else:
+                state[0] = ticks_add(now, self.repeat_ms)
+                state[1] = True
+                changed = self._dispatch(button, LONG)
+            if changed:
+                # the rest of the snapshot was held on the old page
+                return
+
+    async def run(self):
+        while True:
+            now = ticks_ms()
+            for keys, buttons in self._sources:
+                event = keys.events.get()
+                while event is not None:
+                    if event.pressed:
+                        self._on_press(buttons[event.key_number], now)
+                    else:
+                        self._on_release(buttons[event.key_number], now)
+                    event = keys.events.get()
+            self._poll_holds(now)
+            await asyncio.sleep(self.poll_s)
@@ -0,0 +1,99 @@
+"""
+Packed, read-only chord tables
+
+A chord map like chords.nasa_en packed into one bytes object so the deployment
+bundle doesn't have to rebuild a dict of tuples on every boot.
+
+layout:
+    n_modes, n_strings                       1 byte each
+    mode names, then strings                 1 byte length + utf-8 each
+    n_modes * 128 entries                    (string index, next mode index), 0xFF = no chord
+Each entry is indexed by the chord as a bitmask of switch numbers (7 switches -> 128 chords).
+"""
+
+N_SWITCHES = 7
+NO_CHORD = 0xFF
+
+
+def chord_bits(switches):
+    bits = 0
+    for s in switches:
+        bits |= 1 << s
+    return bits
+
+
+def pack(chord_map):
+    """Pack a {mode: {switches: (text, next_mode)}} map into bytes (host side, used by tools/build_bundle.py)"""
+    modes = list(chord_map)
+    strings = []
+    for chords in chord_map.values():
+        for text, next_mode in chords.values():
+            if text not in strings:
+                strings.append(text)
+    if len(modes) >= NO_CHORD or len(strings) >= NO_CHORD:
+        raise ValueError(f"too many modes ({len(modes)}) or strings ({len(strings)}) to pack")
+
+    out = bytearray((len(modes), len(strings)))
+    for s in modes + strings:
+        encoded = s.encode("utf-8")
+        out.append(len(encoded))
+        out.extend(encoded)
+    for mode in modes:
+        entries = bytearray([NO_CHORD, NO_CHORD] * (1 << N_SWITCHES))
+        for switches, (text, next_mode) in chord_map[mode].items():
+            bits = chord_bits(switches)
+            entries[bits * 2] = strings.index(text)
+            entries[bits * 2 + 1] = modes.index(next_mode)
+        out.extend(entries)
+    return bytes(out)
+
+
+class ChordTable(object):
+    """Looks like chords.nasa_en: table[mode][switches] -> (text, next_mode)"""
+    def __init__(self, data):
+        self._data = data
+        n_modes = data[0]
+        n_strings = data[1]
+        offset = 2
+        # (start, end) of every mode name and string, decoded on lookup
+        self._spans = []
+        for _ in range(n_modes + n_strings):
+            end = offset + 1 + data[offset]
+            self._spans.append((offset + 1, end))
+            offset = end
+        self._n_modes = n_modes
+        self._modes = {}
+        for i in range(n_modes):
+            self._modes[self._str(i)] = self.Mode(self, offset + i * (2 << N_SWITCHES))
+
+    def _str(self, i):
+        start, end = self._spans[i]
+        return str(self._data[start:end], "utf-8")
+
+    def __getitem__(self, mode):
+        return self._modes[mode]
+
+    def __contains__(self, mode):
+        return mode in self._modes
+
+    def __iter__(self):
+        return iter(self._modes)
+
+    class Mode(object):
+        def __init__(self, table, offset):
+            self._table = table
+            self._offset = offset
+
+        def __getitem__(self, switches):
+            data = self._table._data
+            i = self._offset + chord_bits(switches) * 2
+            text = data[i]
+            if text == NO_CHORD:
+                raise KeyError(switches)
+            return self._table._str(self._table._n_modes + text), self._table._str(data[i + 1])
+
+        def get(self, switches, default=None):
+            try:
+                return self[switches]
+            except KeyError:
+                return default
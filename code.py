@@ -1,19 +1,29 @@
 """
 Chorded Keyboard in Circuit Python
 """
+import bootprof
 import asyncio
 import digitalio
 import keypad
 import board
 import terminalio
 import displayio
+bootprof.mark("import builtins")
 from adafruit_display_text import bitmap_label, label
 from adafruit_display_shapes.rect import Rect
 import adafruit_logging as logging
 import neopixel
+bootprof.mark("import lib")
 from chords import nasa_en as chord_map
-from widgets import WidgetBase, SpiffChorderUIWidget, DebugWidget, TypistGameWidget, NavigationWidget, PageBase, LastChordedWidget
+bootprof.mark("import chords")
 from keyboard import ChordedKeyboard, Keys, Key
+bootprof.mark("import keyboard")
+from steno import StenoEngine, StenoDictionary
+bootprof.mark("import steno")
+from widgets import WidgetBase, SpiffChorderUIWidget, DebugWidget, TypistGameWidget, NavigationWidget, PageBase, LastChordedWidget
+bootprof.mark("import widgets")
+from buttons import ButtonRouter, LONG
+bootprof.mark("import buttons")
 
 
 """
@@ -21,49 +31,18 @@ Display all things on display module
 """
 
 
-async def display_ui(main_group, current_page, k0, k12):
+async def display_ui(main_group, router):
 
     while True:
-        await asyncio.sleep(0.1)
-        print("lets go into")
-        current_page.into(main_group)
-        while True:
-
-            k12_event = k12.events.get()
-            if k12_event is not None:
-                if k12_event.pressed:
-                    if k12_event.key_number == 0:
-                        if isinstance(current_page.onD1, PageBase):
-                            current_page = current_page.onD1
-                            break
-                        elif callable(current_page.onD1):
-                            current_page.onD1()
-                            break
-
-                    elif k12_event.key_number == 1:
-                        if isinstance(current_page.onD2, PageBase):
-                            current_page = current_page.onD2
-                            break
-                        elif callable(current_page.onD2):
-                            current_page.onD2()
-                            break
-
-            k0_event = k0.events.get()
-            if k0_event is not None:
-                if k0_event.pressed:
-                    if isinstance(current_page.onD0, PageBase):
-                        current_page = current_page.onD0
-                        break
-                    elif callable(current_page.onD0):
-                        current_page.onD0()
-                        break
-
-            current_page.update()
-            # Update this to change the text displayed.
-            board.DISPLAY.show(main_group)
-
-            await asyncio.sleep(0.1)
+        if router.dirty:
+            router.dirty = False
+            router.page.into(main_group)
 
+        router.page.update()
+        # Update this to change the text displayed.
+        board.DISPLAY.show(main_group)
+
+        await asyncio.sleep(0.1)
 
 
 def set_low(pin_name):
@@ -83,9 +62,19 @@ async def main():
     kb_keys.add_key(Key(board.D10, "M", "Middle"))
     kb_keys.add_key(Key(board.D9, "R", "Ring"))
     kb_keys.add_key(Key(board.D6, "P", "Pinky"))
+    bootprof.mark("keys")
+
+    # Set up steno dictionary, if one was built (tools/build_steno.py)
+    try:
+        steno = StenoEngine(StenoDictionary("steno.bin"))
+    except (OSError, ValueError) as err:
+        print(f"no usable steno.bin ({err}), typing letter by letter")
+        steno = None
+    bootprof.mark("steno")
 
     # Set up keyboard
-    kb = ChordedKeyboard(kb_keys)
+    kb = ChordedKeyboard(kb_keys, steno=steno)
+    bootprof.mark("ChordedKeyboard")
 
 
 
@@ -94,18 +83,23 @@ async def main():
     logger = logging.Logger("main")
     logger.setLevel(logging.DEBUG)
     logger.addHandler(debug_widget.handler)
+    bootprof.mark("DebugWidget")
 
     # Set up keyboard on-screen representation
     key_reps = SpiffChorderUIWidget(kb, logger=logger)
+    bootprof.mark("SpiffChorderUIWidget")
 
     # Set up typing game
     game_widget = TypistGameWidget(kb)
+    bootprof.mark("TypistGameWidget")
 
     # Set up navigation
     nav_widget = NavigationWidget()
+    bootprof.mark("NavigationWidget")
 
     # Set up "last chorded" widget
     last_chorded_widget = LastChordedWidget(kb)
+    bootprof.mark("LastChordedWidget")
 
     # Set up main page
     start_page = PageBase("Home", "This is a page where you start")
@@ -120,10 +114,14 @@ async def main():
     game_page.add_widget(nav_widget)
 
     start_page.onD2 = game_page
+    start_page.on(1, LONG, kb.undo, name="undo")
     game_page.onD0 = start_page
+    game_page.on(1, LONG, kb.undo, name="undo")
+    bootprof.mark("pages")
 
     thumb_common = set_low(board.A0)
     imrp_common = set_low(board.D12)
+    bootprof.mark("pins")
 
     # pixel = neopixel.NeoPixel(board.NEOPIXEL, 1)
     # pixel.brightness = 1
@@ -132,22 +130,34 @@ async def main():
     # Apparently there's some "feature" that only allows a group to be added to one group.
     # You can't add the same group to multiple other groups.  So we'll just add all of them to main_group
     main_group = displayio.Group()
+    bootprof.mark("main group")
 
-    # set up the front keys to pass into the display_ui
+    # set up the front keys to feed the button router
+    # keypad debounces the buttons (interval is in seconds), the router gets clean presses/releases
     k0 = keypad.Keys(
         (board.D0,),
         value_when_pressed=False,
-        pull=True
+        pull=True,
+        interval=0.03
     )
     k12 = keypad.Keys(
             (board.D1, board.D2),
             value_when_pressed=True,
-            pull=True
+            pull=True,
+            interval=0.03
     )
+    bootprof.mark("keypad")
+
+    router = ButtonRouter(start_page)
+    router.add_source(k0, (0,))
+    router.add_source(k12, (1, 2))
+    bootprof.mark("ButtonRouter")
+    bootprof.report()
 
     keys_task = asyncio.create_task(kb.monitor_keys())
-    ui_task = asyncio.create_task(display_ui(main_group, start_page, k0, k12))
-    await asyncio.gather(keys_task, ui_task)
+    buttons_task = asyncio.create_task(router.run())
+    ui_task = asyncio.create_task(display_ui(main_group, router))
+    await asyncio.gather(keys_task, buttons_task, ui_task)
 
 asyncio.run(main())
 
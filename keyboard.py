@@ -1,6 +1,7 @@
 
 import asyncio
 import keypad
+from adafruit_ticks import ticks_ms, ticks_diff
 from chords import nasa_en as chord_map
 
 
@@ -22,12 +23,18 @@ class Keys(list):
 
 
 class ChordedKeyboard(object):
-    def __init__(self, keys: Keys):
+    def __init__(self, keys: Keys, steno: "StenoEngine" = None):
         if isinstance(keys, Keys):
             self.keys = keys
         else:
             raise TypeError(f"keys should be of type Keys\n\ttype was {type(keys)}")
         self.mode = "<NORM>"
+        self.steno = steno
+        # held back steno strokes are typed anyway once nothing follows for this long
+        self.steno_timeout_ms = 1000
+        self._stroked_at = 0
+        # the texts on_key got for each recent output, newest last, so undo can take them back
+        self._typed = []
 
     pressed = []
     last_chorded = ''
@@ -44,6 +51,51 @@ class ChordedKeyboard(object):
         self.mode = key_tuple[1]
         self.last_chorded = key_tuple[0]
 
+    def on_chord(self, switches):
+        """Type a released chord, through the steno engine in <NORM> mode, else (or on no match) the per-letter map"""
+        if self.steno is None or self.mode != "<NORM>":
+            outputs = [] if self.steno is None else self.steno.flush()
+            outputs.append(tuple(switches))
+        else:
+            outputs = self.steno.stroke(switches)
+            self._stroked_at = ticks_ms()
+        self._type(outputs)
+
+    def _type(self, outputs):
+        for out in outputs:
+            if isinstance(out, str):
+                # steno words reach subscribers a character at a time, like letter chords
+                key_tuples = [(c, "<NORM>") for c in out]
+            else:
+                try:
+                    key_tuples = [self.switches_to_key_tuple(out)]
+                except KeyError as err:
+                    self.last_chorded = "err"
+                    print(KeyError, err)
+                    continue
+            texts = [kt[0] for kt in key_tuples if kt[0]]
+            if texts:
+                self._typed.append(texts)
+                if len(self._typed) > 16:
+                    self._typed.pop(0)
+            for kt in key_tuples:
+                self.on_key(kt)
+
+    def on_undo(self, text):
+        """Tell subscribers that have an on_undo that text (from one on_key) was taken back"""
+        for sub in self.key_subs:
+            if hasattr(sub, "on_undo"):
+                sub.on_undo(text)
+        self.last_chorded = ""
+
+    def undo(self):
+        """Drop the last steno stroke still being looked ahead on, else take back the last thing typed"""
+        if self.steno is not None and self.steno.undo():
+            return
+        if self._typed:
+            for text in reversed(self._typed.pop()):
+                self.on_undo(text)
+
     def widget_sub(self, subscriber):
         if not callable(subscriber.on_key):
             raise Exception(f"{subscriber} Cant subscribe because on_key non-callable function")
@@ -76,11 +128,7 @@ class ChordedKeyboard(object):
                 if key_event is not None:
                     if hot and key_event.released:
                         ## insert key action code here
-                        try:
-                            self.on_key(self.switches_to_key_tuple(self.pressed))
-                        except KeyError as err:
-                            self.last_chorded = "err"
-                            print(KeyError, err)
+                        self.on_chord(self.pressed)
                         self.pressed.remove(key_event.key_number)
                         hot = False
                     elif key_event.pressed:
@@ -90,6 +138,10 @@ class ChordedKeyboard(object):
                         self.pressed.remove(key_event.key_number)
                     else:
                         print(f"unhandled key event")
+                if (self.steno is not None and self.steno.pending
+                        and ticks_diff(ticks_ms(), self._stroked_at) >= self.steno_timeout_ms):
+                    # nothing followed the held back strokes, don't sit on them
+                    self._type(self.steno.flush())
                 await asyncio.sleep(0)
 
 
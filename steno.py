@@ -0,0 +1,211 @@
+"""
+Stenography style multi-stroke dictionary
+
+Sequences of 2-4 chords (strokes) map to whole words or phrases. The dictionary stays on
+flash as an open addressing hash table that is read a slot at a time. Keys are scrambled
+before the modulo and pack() refuses tables with probe runs over MAX_PROBES slots, so a
+lookup costs the same however many entries it has. Every proper prefix of an entry is in the table too,
+flagged as "has longer", which is what lets the engine look ahead.
+
+layout (little endian):
+    b"STN2", n_slots (u32)
+    n_slots * (key u32, value u32)     key 0 = empty slot, a key starts probing at slot_of(key)
+                                       value bit 0 = a longer sequence starts with this one
+                                       value >> 1 = 1 + offset of the text in the pool, 0 = no text
+    pool                               1 byte length + utf-8 per text
+"""
+import struct
+
+from chordtable import chord_bits
+
+MAGIC = b"STN2"
+MIN_STROKES = 2
+MAX_STROKES = 4
+_HEADER = 8
+# longest run of filled slots (so most slot reads for a hit or a miss) pack() accepts
+MAX_PROBES = 64
+_LONGER = 1
+
+
+def sequence_key(strokes, n):
+    """Key of the first n stroke bitmasks, 7 bits per stroke (strokes are never 0)"""
+    key = 0
+    for i in range(n):
+        key |= strokes[i] << (7 * i)
+    return key
+
+
+def slot_of(key, n_slots):
+    """First slot to probe, keys are multiplicatively hashed so neighbouring keys don't cluster"""
+    return ((key * 2654435761) & 0xFFFFFFFF) % n_slots
+
+
+def _longest_run(slots):
+    """Longest run of filled slots, wrapping around the end of the table"""
+    n_slots = len(slots)
+    start = 0
+    while start < n_slots and slots[start][0]:
+        start += 1
+    if start == n_slots:
+        return n_slots
+    longest = run = 0
+    for i in range(start + 1, start + 1 + n_slots):
+        if slots[i % n_slots][0]:
+            run += 1
+            longest = max(longest, run)
+        else:
+            run = 0
+    return longest
+
+
+def _prime_at_least(n):
+    n |= 1
+    while any(n % d == 0 for d in range(3, int(n ** 0.5) + 1, 2)):
+        n += 2
+    return n
+
+
+def pack(entries):
+    """Pack [(strokes, text)] into bytes (host side, used by tools/build_steno.py)
+
+    strokes is a sequence of switch tuples, e.g. ((0, 3), (3, 4, 5, 6)) -> "the"
+    """
+    values = {}
+    pool = bytearray()
+    for strokes, text in entries:
+        if not MIN_STROKES <= len(strokes) <= MAX_STROKES:
+            raise ValueError(f"{text!r} needs {MIN_STROKES}-{MAX_STROKES} strokes, got {len(strokes)}")
+        bits = [chord_bits(s) for s in strokes]
+        if 0 in bits:
+            raise ValueError(f"{text!r} has an empty stroke")
+        for n in range(1, len(bits)):
+            key = sequence_key(bits, n)
+            values[key] = values.get(key, 0) | _LONGER
+        encoded = text.encode("utf-8")
+        if len(encoded) > 255:
+            raise ValueError(f"{text!r} is longer than 255 bytes")
+        key = sequence_key(bits, len(bits))
+        values[key] = (values.get(key, 0) & _LONGER) | ((len(pool) + 1) << 1)
+        pool.append(len(encoded))
+        pool.extend(encoded)
+
+    # keep the load factor under 1/2 so probes stay short
+    n_slots = _prime_at_least(2 * len(values) + 1)
+    slots = [(0, 0)] * n_slots
+    for key, value in values.items():
+        i = slot_of(key, n_slots)
+        while slots[i][0]:
+            i = (i + 1) % n_slots
+        slots[i] = (key, value)
+    longest = _longest_run(slots)
+    if longest > MAX_PROBES:
+        raise ValueError(f"hash table has a run of {longest} filled slots, lookups could take over {MAX_PROBES} reads")
+
+    out = bytearray(MAGIC + struct.pack("<I", n_slots))
+    for key, value in slots:
+        out.extend(struct.pack("<II", key, value))
+    out.extend(pool)
+    return bytes(out)
+
+
+class StenoDictionary(object):
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        header = self._file.read(_HEADER)
+        if header[:4] != MAGIC:
+            raise ValueError(f"{path} is not a steno dictionary")
+        self._n_slots = struct.unpack("<I", header[4:])[0]
+        self._pool = _HEADER + self._n_slots * 8
+        self._slot = bytearray(8)
+
+    def lookup(self, strokes, n):
+        """-> (text or None, whether a longer sequence starts with these n strokes)"""
+        key = sequence_key(strokes, n)
+        i = slot_of(key, self._n_slots)
+        while True:
+            self._file.seek(_HEADER + i * 8)
+            self._file.readinto(self._slot)
+            slot_key, value = struct.unpack("<II", self._slot)
+            if slot_key == 0:
+                return None, False
+            if slot_key == key:
+                break
+            i = (i + 1) % self._n_slots
+
+        longer = bool(value & _LONGER)
+        offset = value >> 1
+        if not offset:
+            return None, longer
+        self._file.seek(self._pool + offset - 1)
+        length = self._file.read(1)[0]
+        return str(self._file.read(length), "utf-8"), longer
+
+    def close(self):
+        self._file.close()
+
+
+class StenoEngine(object):
+    """Resolves strokes into words as they arrive
+
+    stroke() returns what can be emitted so far, in order: a str for a dictionary match,
+    or the stroke's switch tuple when it has to fall back to the per-letter chord map.
+    Strokes that could still grow into a longer entry are held back (lookahead).
+    """
+    def __init__(self, dictionary: StenoDictionary):
+        self._dict = dictionary
+        self._pending = []
+        self._pending_switches = []
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def stroke(self, switches):
+        self._pending.append(chord_bits(switches))
+        self._pending_switches.append(tuple(switches))
+        out = []
+        self._resolve(out, False)
+        return out
+
+    def flush(self):
+        """Emit whatever is held back, e.g. before a mode change"""
+        out = []
+        self._resolve(out, True)
+        return out
+
+    def undo(self):
+        """Drop the last held back stroke, returns False when there was none"""
+        if not self._pending:
+            return False
+        self._pending.pop()
+        self._pending_switches.pop()
+        return True
+
+    def _take(self, n):
+        del self._pending[:n]
+        del self._pending_switches[:n]
+
+    def _resolve(self, out, final):
+        pending = self._pending
+        while pending:
+            text, longer = self._dict.lookup(pending, len(pending))
+            if longer and not final and len(pending) < MAX_STROKES:
+                return
+            if text is not None:
+                out.append(text)
+                self._take(len(pending))
+                return
+
+            # the sequence went nowhere: emit the longest match off the front, or a single letter
+            n = len(pending) - 1
+            while n >= MIN_STROKES:
+                text = self._dict.lookup(pending, n)[0]
+                if text is not None:
+                    break
+                n -= 1
+            if n >= MIN_STROKES:
+                out.append(text)
+                self._take(n)
+            else:
+                out.append(self._pending_switches[0])
+                self._take(1)
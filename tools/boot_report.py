@@ -0,0 +1,73 @@
+"""
+Compare boot phases between bundles
+
+Capture the serial console of each bundle booting (the "bootprof,<phase>,<ms>" lines
+bootprof.report() prints) to a file, then compare the last boot in each:
+
+    python tools/boot_report.py source.log bundle.log
+"""
+import argparse
+import os
+
+
+def read_phases(path):
+    """-> [(phase, ms spent in the phase)] of the last boot in the capture, in boot order
+
+    A capture often holds several boots (copying a bundle auto-reloads the board), a new
+    one starts at its "start" mark or whenever the clock doesn't go forward.
+    """
+    phases = []
+    last = None
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith("bootprof,"):
+                continue
+            _, phase, ms = line.rsplit(",", 2)
+            ms = float(ms)
+            if phase == "start":
+                # the start phase is the time from boot up to bootprof's import
+                phases = []
+                last = 0.0
+            elif last is None or ms <= last:
+                # a boot whose start mark is missing from the capture
+                phases = []
+                last = ms
+            phases.append((phase, ms - last))
+            last = ms
+    return phases
+
+
+def report(paths):
+    runs = []
+    order = []
+    for p in paths:
+        phases = read_phases(p)
+        runs.append(dict(phases))
+        for phase, _ in phases:
+            if phase not in order:
+                order.append(phase)
+
+    names = [os.path.basename(p) for p in paths]
+    width = max([len(p) for p in order] + [len("total")])
+    header = f"{'phase':<{width}}" + "".join(f"{n:>14}" for n in names)
+    if len(paths) > 1:
+        header += f"{'delta':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for phase in order + ["total"]:
+        if phase == "total":
+            values = [sum(r.values()) for r in runs]
+        else:
+            values = [r.get(phase) for r in runs]
+        row = f"{phase:<{width}}" + "".join(f"{'-' if v is None else f'{v:.1f}':>14}" for v in values)
+        if len(paths) > 1 and values[0] is not None and values[-1] is not None:
+            row += f"{values[-1] - values[0]:>+10.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare boot phases between bundles")
+    parser.add_argument("logs", nargs="+", help="serial captures, the first is the baseline")
+    report(parser.parse_args().logs)
@@ -0,0 +1,106 @@
+"""
+Build a deployment bundle for the CIRCUITPY drive
+
+    python tools/build_bundle.py [--out dist] [--mpy-cross mpy-cross] [--no-mpy] [--keep-prints]
+
+- project modules are precompiled to .mpy with mpy-cross (must match the board's CircuitPython version)
+- code.py becomes app.mpy behind a one line code.py, CircuitPython only runs code.py from source
+- chords.nasa_en is packed into a chordtable.ChordTable so no dict is built on boot
+- statement print() calls are stripped (bootprof keeps its report)
+- steno.txt, if there is one, is packed into steno.bin
+"""
+import argparse
+import ast
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from chords import nasa_en
+from chordtable import pack
+from build_steno import build_steno
+
+# modules compiled as-is (apart from print stripping)
+MODULES = ["keyboard", "widgets", "words", "buttons", "chordtable", "steno", "bootprof"]
+KEEP_PRINTS = ["bootprof"]
+
+
+def strip_prints(source):
+    """Replace every statement level print(...) call with pass, keeping line numbers for tracebacks"""
+    lines = source.splitlines(keepends=True)
+    for node in ast.walk(ast.parse(source)):
+        if (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+                and isinstance(node.value.func, ast.Name) and node.value.func.id == "print"):
+            first, last = node.lineno - 1, node.end_lineno - 1
+            indent = lines[first][:node.col_offset]
+            lines[first] = indent + "pass\n"
+            for i in range(first + 1, last + 1):
+                lines[i] = "\n"
+    return "".join(lines)
+
+
+def chords_source():
+    return ("from chordtable import ChordTable\n"
+            f"nasa_en = ChordTable({pack(nasa_en)!r})\n")
+
+
+def emit(name, source, out, args):
+    if args.no_mpy:
+        with open(os.path.join(out, name + ".py"), "w") as f:
+            f.write(source)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, name + ".py")
+        with open(src, "w") as f:
+            f.write(source)
+        subprocess.run([args.mpy_cross, "-o", os.path.join(out, name + ".mpy"), src], check=True)
+
+
+def copy_lib(out):
+    # skip the macOS "._" resource forks that ride along in lib/
+    shutil.copytree(os.path.join(ROOT, "lib"), os.path.join(out, "lib"),
+                    ignore=shutil.ignore_patterns("._*", "__pycache__"))
+
+
+def build(args):
+    out = os.path.abspath(args.out)
+    if os.path.exists(out):
+        shutil.rmtree(out)
+    os.makedirs(out)
+    copy_lib(out)
+
+    for name in MODULES:
+        with open(os.path.join(ROOT, name + ".py")) as f:
+            source = f.read()
+        if not args.keep_prints and name not in KEEP_PRINTS:
+            source = strip_prints(source)
+        emit(name, source, out, args)
+
+    emit("chords", chords_source(), out, args)
+
+    steno_source = os.path.join(ROOT, "steno.txt")
+    if os.path.exists(steno_source):
+        build_steno(steno_source, os.path.join(out, "steno.bin"))
+
+    with open(os.path.join(ROOT, "code.py")) as f:
+        source = f.read()
+    if not args.keep_prints:
+        source = strip_prints(source)
+    emit("app", source, out, args)
+    with open(os.path.join(out, "code.py"), "w") as f:
+        f.write("import app\n")
+
+    print(f"bundle written to {out}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a precompiled deployment bundle")
+    parser.add_argument("--out", default=os.path.join(ROOT, "dist"))
+    parser.add_argument("--mpy-cross", default="mpy-cross", help="mpy-cross matching the board's CircuitPython")
+    parser.add_argument("--no-mpy", action="store_true", help="write stripped .py sources instead of .mpy")
+    parser.add_argument("--keep-prints", action="store_true", help="don't strip debug print calls")
+    build(parser.parse_args())
@@ -0,0 +1,58 @@
+"""
+Build steno.bin from a steno dictionary source
+
+    python tools/build_steno.py [steno.txt] [steno.bin]
+
+One entry per line: strokes separated by "/", each stroke written with the switch letters
+of chords.py (N C F I M R P), then a tab and the word or phrase. "#" starts a comment.
+
+    NI/IMRP	the
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from steno import pack
+
+# switch number of each letter, see the top of chords.py
+SWITCH_LETTERS = "NCFIMRP"
+
+
+def parse_stroke(stroke):
+    try:
+        return tuple(sorted(SWITCH_LETTERS.index(c) for c in stroke))
+    except ValueError:
+        raise ValueError(f"bad stroke {stroke!r}, use the letters {SWITCH_LETTERS}")
+
+
+def read_entries(path):
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            try:
+                strokes, text = line.split("\t", 1)
+                entries.append((tuple(parse_stroke(s) for s in strokes.split("/")), text))
+            except ValueError as err:
+                raise ValueError(f"{path}:{n}: {err}")
+    return entries
+
+
+def build_steno(source, target):
+    entries = read_entries(source)
+    with open(target, "wb") as f:
+        f.write(pack(entries))
+    print(f"{len(entries)} steno entries written to {target}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a steno dictionary")
+    parser.add_argument("source", nargs="?", default=os.path.join(ROOT, "steno.txt"))
+    parser.add_argument("target", nargs="?", default=os.path.join(ROOT, "steno.bin"))
+    args = parser.parse_args()
+    build_steno(args.source, args.target)
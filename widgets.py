@@ -14,6 +14,7 @@ from adafruit_display_shapes.rect import Rect
 from adafruit_display_shapes.polygon import Polygon
 
 from keyboard import Keys, Key, ChordedKeyboard
+from buttons import SHORT
 
 __old_stdout__ = sys.stdout
 
@@ -37,9 +38,10 @@ class PageBase(list):
         self.page_name = page_name
         self.page_description = page_description
         self._widgets = []
-        self._onD0 = None
-        self._onD1 = None
-        self._onD2 = None
+        # (button, gesture) -> page to go to, or callable
+        self._callbacks = {}
+        # button -> what to call it on the navigation bar when it isn't a page
+        self._names = {}
 
     def update(self):
         for wid in self._widgets:
@@ -59,29 +61,48 @@ class PageBase(list):
             w.once(self)
             group.append(w)
 
+    def on(self, button, gesture, cb, name=None):
+        """Bind a page or callable to a front button gesture (SHORT, LONG or REPEAT), name labels it for navigation"""
+        if cb is None:
+            self._callbacks.pop((button, gesture), None)
+        else:
+            self._callbacks[(button, gesture)] = cb
+        if name is not None:
+            self._names[button] = name
+
+    def callback(self, button, gesture=SHORT):
+        return self._callbacks.get((button, gesture))
+
+    def label(self, button):
+        """Name of the page a button goes to, else the name it was bound with, else None"""
+        try:
+            return self.callback(button).page_name
+        except AttributeError:
+            return self._names.get(button)
+
     @property
     def onD0(self):
-        return self._onD0
+        return self.callback(0)
 
     @onD0.setter
     def onD0(self, cb):
-        self._onD0 = cb
+        self.on(0, SHORT, cb)
 
     @property
     def onD1(self):
-        return self._onD1
+        return self.callback(1)
 
     @onD1.setter
     def onD1(self, cb):
-        self._onD1 = cb
+        self.on(1, SHORT, cb)
 
     @property
     def onD2(self):
-        return self._onD2
+        return self.callback(2)
 
     @onD2.setter
     def onD2(self, cb):
-        self._onD2 = cb
+        self.on(2, SHORT, cb)
 
 
 class SpiffChorderUIWidget(WidgetBase):
@@ -189,6 +210,8 @@ class TypistGameWidget(WidgetBase):
 
         self.level = 0
         self.current_letter = 0
+        # whether each letter typed at this word moved it on, for on_undo
+        self._hits = []
         self._new_word()
 
         self._highlighter = Rect(self._word_label.x + self._word_label[0][0].x,
@@ -245,6 +268,7 @@ class TypistGameWidget(WidgetBase):
     def _next_word(self, page=None):
         self._word_label.hidden = False
         self.current_letter = 0
+        self._hits = []
         self._new_word()
 
     def update(self):
@@ -254,9 +278,18 @@ class TypistGameWidget(WidgetBase):
         print(f"char: {char_tuple[0]}")
         if char_tuple[0] == self._word_label.text[self.current_letter]:
             self.current_letter += 1
+            self._hits.append(True)
             if self.current_letter >= len(self._word_label.text):
                 self.current_letter = 0
+                self._hits = []
                 self._new_word()
+        elif char_tuple[0]:
+            self._hits.append(False)
+        self._highlight(self.current_letter)
+
+    def on_undo(self, text):
+        if self._hits and self._hits.pop():
+            self.current_letter -= 1
         self._highlight(self.current_letter)
 
     def once(self, page: PageBase):
@@ -297,21 +330,13 @@ class NavigationWidget(WidgetBase):
 
     def once(self, page: PageBase):
         """do a update on the names of all the nav"""
-        try:
-            self._d0_label.text = page.onD0.page_name
-        except Exception as err:
-            print("no page name for D0 found")
-            # self._d0_label.text = ""
-        try:
-            self._d1_label.text = page.onD1.page_name
-        except Exception as err:
-            print("no page name for D1 found")
-            # self._d1_label.text = ""
-        try:
-            self._d2_label.text = page.onD2.page_name
-        except Exception as err:
-            print("no page name for D2 found")
-            # self._d2_label.text = ""
+        for button, nav_label in enumerate((self._d0_label, self._d1_label, self._d2_label)):
+            name = page.label(button)
+            if name is None:
+                print(f"no page name for D{button} found")
+                # nav_label.text = ""
+            else:
+                nav_label.text = name
 
 
 class LastChordedWidget(WidgetBase):
@@ -359,3 +384,6 @@ class LastChordedWidget(WidgetBase):
         self._char_label.text = char[0]
         self._anim_on_key = 0xF000
         print(f"char label h: {self._char_label.height} w: {self._char_label.width}")
+
+    def on_undo(self, text):
+        self._char_label.text = ""